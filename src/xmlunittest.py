@@ -1,7 +1,9 @@
 """Unittest module for XML testing purpose."""
 from __future__ import annotations
 
+import functools
 import io
+import os
 import unittest
 from typing import TYPE_CHECKING
 
@@ -10,10 +12,124 @@ from lxml.doctestcompare import PARSE_XML, LXMLOutputChecker
 from lxml.etree import XMLSyntaxError, XPathSyntaxError
 
 if TYPE_CHECKING:
-    from typing import Any, Union
+    from typing import Any, Iterable, Tuple, Union
 
 __all__ = ['XmlTestMixin', 'XmlTestCase']
 
+# The output checker does not keep any state between comparisons.
+_output_checker = LXMLOutputChecker()
+
+
+def _xpath_namespaces(node, default_ns_prefix):
+    """Return the namespaces of ``node`` as sorted ``(prefix, uri)`` pairs.
+
+    The default namespace (without prefix) uses ``default_ns_prefix``. The
+    result is hashable, so it can be used as a key for :func:`_compile_xpath`.
+    """
+    nsmap = node.nsmap
+    if not nsmap:
+        # Most documents do not declare any namespace
+        return ()
+
+    namespaces = dict(
+        (prefix or default_ns_prefix, url)
+        for prefix, url in nsmap.items())
+    return tuple(sorted(namespaces.items()))
+
+
+class _LazyMessage:
+    """Failure message, formatted only when it is displayed.
+
+    Callable ``args`` are called to get their value, so an expensive part of
+    the message (such as a serialized document) is only computed if needed,
+    and not when the failure is caught and ignored.
+    """
+
+    def __init__(self, message, *args):
+        self.message = message
+        self.args = args
+        self.text = None
+
+    def __str__(self):
+        if self.text is None:
+            self.text = self.message % tuple(
+                arg() if callable(arg) else arg for arg in self.args)
+        return self.text
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __reduce__(self):
+        # Pickled as its text, e.g. to send a failure to another process
+        return (str, (str(self),))
+
+
+def _canonicalize(data):
+    """Return the canonical form of the XML string ``data``.
+
+    Text is stripped and namespace prefixes are rewritten, so outputs that
+    only differ by spaces, attributes' order, or prefixes, are the same.
+    """
+    return etree.canonicalize(
+        etree.fromstring(data),
+        with_comments=True,
+        strip_text=True,
+        rewrite_prefixes=True)
+
+
+# Only the expected output is cached: it is often compared to many others,
+# while the given output is usually new, and can be large.
+_canonicalize_expected = functools.lru_cache(maxsize=64)(_canonicalize)
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_xpath(xpath, namespaces):
+    """Compile ``xpath`` with ``namespaces`` (as a tuple of pairs).
+
+    Compiled expressions are cached, so the same XPath used with the same
+    namespaces is compiled only once, whatever the node it is used on.
+    """
+    return etree.XPath(xpath, namespaces=dict(namespaces))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_schema(schema_class, filename, mtime):
+    """Build a ``schema_class`` validator from the file at ``filename``.
+
+    The ``mtime`` of the file is part of the cache key, so a file changed on
+    disk is loaded again.
+    """
+    if schema_class is etree.DTD:
+        return etree.DTD(filename)
+    return schema_class(etree.parse(filename))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_dtd(dtd):
+    """Build a DTD validator from its source, as ``str`` or ``bytes``."""
+    if isinstance(dtd, str):
+        dtd = dtd.encode('utf-8')
+    return etree.DTD(io.BytesIO(dtd))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_xschema(xschema):
+    """Build an XMLSchema validator from its source."""
+    return etree.XMLSchema(etree.XML(xschema))
+
+
+@functools.lru_cache(maxsize=32)
+def _schema_parser(schema):
+    """Return a parser validating documents against the XMLSchema ``schema``.
+    """
+    return etree.XMLParser(schema=schema)
+
+
+def _schema_from_file(schema_class, filename):
+    """Return the (cached) ``schema_class`` validator for ``filename``."""
+    return _load_schema(
+        schema_class, filename, os.stat(filename).st_mtime_ns)
+
 
 class XmlTestMixin:
     """Base mixin class for XML unittest.
@@ -38,54 +154,67 @@ class XmlTestMixin:
     """
     default_partial_tag = 'partialTest'
     error_encoding = 'utf-8'
+    xml_parser = None
 
     def fail_xpath_error(self, node, xpath, exception):
         """Format an xpath ``expression`` error for the given ``node``.
 
         This method should be used instead of the ``fail`` method.
         """
-        doc = etree.tostring(
-            node, pretty_print=True, encoding=self.error_encoding)
-        self.fail(
+        self.fail(_LazyMessage(
             'Invalid XPath expression for element %s: %s\n'
             'Xpath: %s\n'
             'Element:\n'
-            '%s' % (
-                node.tag,
-                str(exception),
-                xpath,
-                doc.decode(self.error_encoding)))
+            '%s',
+            node.tag,
+            str(exception),
+            xpath,
+            functools.partial(self.format_node, node)))
 
     def fail_xpath_not_found(self, node, expression):
-        doc = etree.tostring(
-            node, pretty_print=True, encoding=self.error_encoding)
-        self.fail(
+        self.fail(_LazyMessage(
             'No result found for XPath for element %s\n'
             'XPath: %s\n'
             'Element:\n'
-            '%s' % (
-                node.tag,
-                expression.path,
-                doc.decode(self.error_encoding)))
+            '%s',
+            node.tag,
+            expression.path,
+            functools.partial(self.format_node, node)))
+
+    def format_node(self, node):
+        """Serialize ``node`` for a failure message.
+
+        This is only called when the failure message is displayed, as
+        serializing a large document is expensive. The output is decoded using
+        :attr:`error_encoding`.
+        """
+        doc = etree.tostring(
+            node, pretty_print=True, encoding=self.error_encoding)
+        return doc.decode(self.error_encoding)
 
     def build_xpath_expressions(self, node, xpaths, default_ns_prefix='ns'):
-        namespaces = dict(
-            (prefix or default_ns_prefix, url)
-            for prefix, url in node.nsmap.items())
+        namespaces = _xpath_namespaces(node, default_ns_prefix)
 
         for xpath in xpaths:
+            if isinstance(xpath, etree.XPath):
+                # Already compiled, with its own namespaces
+                yield xpath
+                continue
+
             try:
-                yield etree.XPath(xpath, namespaces=namespaces)
+                yield _compile_xpath(xpath, namespaces)
             except XPathSyntaxError as error:
                 self.fail_xpath_error(node, xpath, error)
 
     def build_xpath_expression(self, node, xpath, default_ns_prefix='ns'):
-        namespaces = dict(
-            (prefix or default_ns_prefix, url)
-            for prefix, url in node.nsmap.items())
+        if isinstance(xpath, etree.XPath):
+            # Already compiled, with its own namespaces
+            return xpath
+
+        namespaces = _xpath_namespaces(node, default_ns_prefix)
 
         try:
-            return etree.XPath(xpath, namespaces=namespaces)
+            return _compile_xpath(xpath, namespaces)
         except XPathSyntaxError as error:
             self.fail_xpath_error(node, xpath, error)
 
@@ -112,10 +241,18 @@ class XmlTestMixin:
             This assertion method requires a :class:`bytes`, as your string
             should be properly encoded first.
 
+        The document is parsed with :attr:`xml_parser`. By default, it is
+        ``None`` and ``lxml`` uses its default parser, which is reused for
+        each call. A test case can set its own :py:class:`lxml.etree.XMLParser`
+        instance, created once, to tune the parser's options::
+
+            class CustomTestCase(XmlTestCase):
+                xml_parser = etree.XMLParser(collect_ids=False)
+
         """
         # no assertion yet
         try:
-            doc = etree.fromstring(data)
+            doc = etree.fromstring(data, self.xml_parser)
         except XMLSyntaxError as e:
             raise self.fail('Input is not a valid XML document: %s' % e)
 
@@ -123,19 +260,22 @@ class XmlTestMixin:
 
     def assertXmlPartial(
         self,
-        partial_data: str,
+        partial_data: Union[str, bytes],
         root_tag: Union[str, None] = None,
     ):
         """Assert ``data`` is an XML partial document, and return result.
 
-        :param partial_data: Partial document as XML formated string
+        :param partial_data: Partial document as XML formated string (a
+                             ``bytes`` string is expected to be UTF-8)
         :param root_tag: Optional, root element's tag name
 
         This method encapsulates the ``partial_data`` into a root element then
         parse the string as an XML document.
 
         By default, this method uses :attr:`default_partial_tag` as the root
-        element's tag name, or you can provide a ``root_tag``.
+        element's tag name, or you can provide a ``root_tag``. As for
+        :meth:`assertXmlDocument`, the document is parsed with
+        :attr:`xml_parser`.
 
         If the parsing fails, the test will fail. If the parsing's result does
         not have any child element, the test will also fail, because it expects
@@ -163,10 +303,14 @@ class XmlTestMixin:
         tag_name = (
             root_tag if root_tag is not None
             else self.default_partial_tag)
-        consolidated = '<%s>%s</%s>' % (tag_name, partial_data, tag_name)
+        if isinstance(partial_data, str):
+            partial_data = partial_data.encode('utf-8')
+        tag_name = tag_name.encode('utf-8')
+        consolidated = b''.join((
+            b'<', tag_name, b'>', partial_data, b'</', tag_name, b'>'))
 
         try:
-            doc = etree.fromstring(consolidated)
+            doc = etree.fromstring(consolidated, self.xml_parser)
         except XMLSyntaxError as e:
             raise self.fail('Input is not a valid partial XML document: %s'
                             % e)
@@ -312,13 +456,17 @@ class XmlTestMixin:
         node,
         xpaths: tuple,
         default_ns_prefix: str = 'ns',
+        **variables,
     ):
         """Assert at least one value is found for each ``xpaths``.
 
         :param node: Element node
-        :param xpaths: List of XPath expressions
+        :param xpaths: List of XPath expressions, as strings or compiled
+                       :py:class:`lxml.etree.XPath` objects
         :param default_ns_prefix: Optional, value of the default namespace
-                                  prefix
+                                  prefix (ignored by compiled expressions)
+        :param variables: Optional, values of the XPath variables used in
+                          the expressions (as ``$name``)
 
         This method tests that all XPath expressions from ``xpaths``
         evaluate on ``node`` to at least one element or a not ``None`` value.
@@ -350,7 +498,7 @@ class XmlTestMixin:
                                                    default_ns_prefix)
         for expression in expressions:
             try:
-                if not expression(node):
+                if not expression(node, **variables):
                     self.fail_xpath_not_found(node, expression)
             except etree.XPathEvalError as error:
                 self.fail_xpath_error(node, expression.path, error)
@@ -360,13 +508,17 @@ class XmlTestMixin:
         node,
         xpaths: tuple,
         default_ns_prefix: str = 'ns',
+        **variables,
     ):
         """Assert ``xpaths`` expressions return only one element each.
 
         :param node: Element node
-        :param xpaths: List of XPath expressions
+        :param xpaths: List of XPath expressions, as strings or compiled
+                       :py:class:`lxml.etree.XPath` objects
         :param default_ns_prefix: Optional, value of the default namespace
-                                  prefix
+                                  prefix (ignored by compiled expressions)
+        :param variables: Optional, values of the XPath variables used in
+                          the expressions (as ``$name``)
 
         .. rubric:: Example
 
@@ -389,42 +541,64 @@ class XmlTestMixin:
 
             # ...
         """
+        xpaths = tuple(xpaths)
+        namespaces = _xpath_namespaces(node, default_ns_prefix)
         expressions = self.build_xpath_expressions(node,
                                                    xpaths,
                                                    default_ns_prefix)
 
-        for expression in expressions:
-            try:
-                results = expression(node)
-            except etree.XPathEvalError as error:
-                self.fail_xpath_error(node, expression.path, error)
-
-            if not results:
+        for xpath, expression in zip(xpaths, expressions):
+            count = None
+
+            # Let libxml2 count the results instead of building the list.
+            # A compiled expression may use other namespaces than the node's.
+            if not isinstance(xpath, etree.XPath):
+                try:
+                    counter = _compile_xpath(
+                        'count(%s)' % expression.path, namespaces)
+                    count = int(counter(node, **variables))
+                except (XPathSyntaxError, etree.XPathEvalError):
+                    # Not a node-set (or an invalid expression)
+                    count = None
+
+            if count is None:
+                try:
+                    results = expression(node, **variables)
+                except etree.XPathEvalError as error:
+                    self.fail_xpath_error(node, expression.path, error)
+
+                count = len(results) if results else 0
+
+            if not count:
                 self.fail_xpath_not_found(node, expression)
 
-            count = len(results)
             if count > 1:
-                self.fail('Too many results found (%d) for XPath on '
-                          'element %s:\n'
-                          'XPath: %s\n'
-                          'Element:\n'
-                          '%s' % (count,
-                                  node.tag,
-                                  expression.path,
-                                  etree.tostring(node, pretty_print=True)))
+                self.fail(_LazyMessage(
+                    'Too many results found (%d) for XPath on element %s:\n'
+                    'XPath: %s\n'
+                    'Element:\n'
+                    '%s',
+                    count,
+                    node.tag,
+                    expression.path,
+                    functools.partial(self.format_node, node)))
 
     def assertXpathsUniqueValue(
         self,
         node,
         xpaths: tuple,
         default_ns_prefix: str = 'ns',
+        **variables,
     ):
         """Assert values found by ``xpaths`` are unique per XPath expression.
 
         :param node: Element node
-        :param xpaths: List of XPath expressions
+        :param xpaths: List of XPath expressions, as strings or compiled
+                       :py:class:`lxml.etree.XPath` objects
         :param default_ns_prefix: Optional, value of the default namespace
-                                  prefix
+                                  prefix (ignored by compiled expressions)
+        :param variables: Optional, values of the XPath variables used in
+                          the expressions (as ``$name``)
 
         This method tests that all the values are unique per XPath expression.
 
@@ -463,16 +637,21 @@ class XmlTestMixin:
 
         for expression in expressions:
             try:
-                results = expression(node)
+                results = expression(node, **variables)
             except etree.XPathEvalError as error:
                 self.fail_xpath_error(node, expression.path, error)
 
-            if len(results) != len(set(results)):
-                self.fail('Value is not unique for element %s:\n'
-                          'XPath: %s\n'
-                          'Element:\n%s'
-                          % (node.tag, expression.path,
-                             etree.tostring(node, pretty_print=True)))
+            # Stop at the first duplicate instead of building the whole set
+            seen = set()
+            for result in results:
+                if result in seen:
+                    self.fail(_LazyMessage(
+                        'Value is not unique for element %s:\n'
+                        'XPath: %s\n'
+                        'Element:\n%s',
+                        node.tag, expression.path,
+                        functools.partial(self.format_node, node)))
+                seen.add(result)
 
     def assertXpathValues(
         self,
@@ -480,18 +659,26 @@ class XmlTestMixin:
         xpath: str,
         values: tuple,
         default_ns_prefix: str = 'ns',
+        **variables,
     ):
         """Assert all values found by ``xpath`` match expected ``values``.
 
         :param node: Element node
-        :param xpath: XPath expression to select elements
+        :param xpath: XPath expression to select elements, as a string or a
+                      compiled :py:class:`lxml.etree.XPath` object
         :param values: List of accepted values
         :param default_ns_prefix: Optional, value of the default namespace
-                                  prefix
+                                  prefix (ignored by compiled expressions)
+        :param variables: Optional, values of the XPath variables used in
+                          the expression (as ``$name``)
 
         This method tests if all the values found from the given XPath
         expression match any element in ``values``.
 
+        As expressions are compiled once and then reused, prefer XPath
+        variables over formatting values into the expression: the same
+        compiled expression serves every value.
+
         .. rubric:: Example
 
         ::
@@ -512,6 +699,10 @@ class XmlTestMixin:
                 self.assertXpathValues(root, './sub/@id', ('1', '2', '3', '4'))
                 # Select node's text value
                 self.assertXpathValues(root, './sub/text()', ('a', 'b', 'c'))
+                # Use an XPath variable
+                self.assertXpathValues(
+                    root, './sub[@id=$id]/text()', ('b',), id='3'
+                )
 
             # ...
 
@@ -519,26 +710,96 @@ class XmlTestMixin:
         expression = self.build_xpath_expression(node,
                                                  xpath,
                                                  default_ns_prefix)
+        self.check_xpath_values(node, expression, values, **variables)
+
+    def assertXpathValuesBatch(
+        self,
+        node,
+        pairs: Iterable[Tuple[str, tuple]],
+        default_ns_prefix: str = 'ns',
+        **variables,
+    ):
+        """Assert values found by each XPath match their expected values.
+
+        :param node: Element node
+        :param pairs: List of ``(xpath, values)``, with an XPath expression
+                      (string or compiled) and its list of accepted values
+        :param default_ns_prefix: Optional, value of the default namespace
+                                  prefix (ignored by compiled expressions)
+        :param variables: Optional, values of the XPath variables used in
+                          the expressions (as ``$name``)
+
+        This method is the same as calling :meth:`assertXpathValues` for
+        each pair, but all the expressions are compiled first, with the
+        namespaces of ``node`` computed only once, then they are evaluated
+        one by one. It stops at the first invalid value.
+
+        .. rubric:: Example
+
+        ::
+
+            # ...
+
+            def test_custom_test(self):
+                data = \"\"\"<?xml version="1.0" encoding="UTF-8" ?>
+                <root>
+                    <sub id="1">a</sub>
+                    <sub id="2">a</sub>
+                    <sub id="3">b</sub>
+                </root>\"\"\"
+                root = self.assertXmlDocument(data.encode('utf-8'))
+
+                self.assertXpathValuesBatch(root, (
+                    ('./sub/@id', ('1', '2', '3')),
+                    ('./sub/text()', ('a', 'b')),
+                ))
+
+            # ...
+
+        """
+        pairs = tuple(pairs)
+        expressions = list(self.build_xpath_expressions(
+            node, [xpath for xpath, values in pairs], default_ns_prefix))
+
+        for expression, (_, values) in zip(expressions, pairs):
+            self.check_xpath_values(node, expression, values, **variables)
+
+    def check_xpath_values(self, node, expression, values, **variables):
+        """Evaluate ``expression`` on ``node`` and check its ``values``.
+
+        This method fails if any result is not in ``values``.
+        """
         try:
-            results = expression(node)
+            results = expression(node, **variables)
         except etree.XPathEvalError as error:
             self.fail_xpath_error(node, expression.path, error)
 
+        if isinstance(values, (str, bytes)):
+            # Keep the substring semantic of ``in`` on a single string
+            accepted = values
+        else:
+            try:
+                accepted = frozenset(values)
+            except TypeError:
+                # Unhashable values: check them one by one
+                accepted = values
+
         for result in results:
-            if result not in values:
-                self.fail('Invalid value found for node %s\n'
-                          'XPath: %s\n'
-                          'Value found: %s\n'
-                          'Element:\n%s'
-                          % (node.tag, xpath, result,
-                             etree.tostring(node, pretty_print=True)))
+            if result not in accepted:
+                self.fail(_LazyMessage(
+                    'Invalid value found for node %s\n'
+                    'XPath: %s\n'
+                    'Value found: %s\n'
+                    'Element:\n%s',
+                    node.tag, expression.path, result,
+                    functools.partial(self.format_node, node)))
 
     def assertXmlValidDTD(self, node, dtd=None, filename=None):
         """Assert XML node is valid according to a DTD.
 
         :param node: Node element to valid using a DTD
         :param dtd: DTD used to valid the given node element. Can be a string
-                    or an LXML DTD element
+                    (``str`` or ``bytes``) or an LXML DTD element
         :param filename: Path to the expected DTD for validation.
 
         This method tests if the given ``node`` complies with a DTD.
@@ -574,11 +835,10 @@ class XmlTestMixin:
         if isinstance(dtd, etree.DTD):
             schema = dtd
         elif dtd is not None:
-            schema = etree.DTD(io.StringIO(dtd))
+            schema = _load_dtd(dtd)
 
         if schema is None and filename is not None:
-            with open(filename, 'r') as fd:
-                schema = etree.DTD(fd)
+            schema = _schema_from_file(etree.DTD, filename)
 
         if schema is None:
             raise ValueError('No valid DTD given.')
@@ -594,6 +854,8 @@ class XmlTestMixin:
         :param xschema: XMLSchema used to valid the given node element.
                         Can be a string or an LXML XMLSchema element
         :param filename: Path to the expected XMLSchema for validation.
+        :param encoding: Unused, the file is parsed as is, according to its
+                         own XML declaration
 
         This method tests if the given ``node`` complies with an XML schema.
         This schema can be provided as a string, as a
@@ -655,9 +917,7 @@ class XmlTestMixin:
             schema = xschema
 
         if xschema is None and filename is not None:
-            with open(filename, 'r') as xschema_file:
-                schema = etree.XMLSchema(
-                    etree.XML(xschema_file.read().encode(encoding)))
+            schema = _schema_from_file(etree.XMLSchema, filename)
 
         if schema is None:
             raise ValueError('No valid XMLSchema given.')
@@ -678,7 +938,8 @@ class XmlTestMixin:
         :param relaxng: RelaxNG used to valid the given node element.
                         Can be a string or an LXML RelaxNG element
         :param filename: Path to the expected RelaxNG for validation.
-        :param encoding: expected encoding for the file
+        :param encoding: Unused, the file is parsed as is, according to its
+                         own XML declaration
 
         This method tests if the given ``node`` complies with a RelaxNG schema.
         This schema can be provided as a string, as a
@@ -725,9 +986,7 @@ class XmlTestMixin:
             schema = relaxng
 
         if relaxng is None and filename is not None:
-            with open(filename, 'r', encoding=encoding) as relaxng_file:
-                schema = etree.RelaxNG(
-                    etree.XML(relaxng_file.read().encode(encoding)))
+            schema = _schema_from_file(etree.RelaxNG, filename)
 
         if schema is None:
             raise ValueError('No valid RelaxNG given.')
@@ -735,6 +994,81 @@ class XmlTestMixin:
         if not schema.validate(node):
             self.fail(schema.error_log.last_error)
 
+    def assertXmlDocumentValid(
+        self,
+        data: bytes,
+        *,
+        dtd=None,
+        xschema=None,
+        relaxng=None,
+    ):
+        """Assert ``data`` is an XML document valid for a schema and return it.
+
+        :param data: XML formated string
+        :param dtd: Optional, DTD used to valid the document (see
+                    :meth:`assertXmlValidDTD`)
+        :param xschema: Optional, XMLSchema used to valid the document (see
+                        :meth:`assertXmlValidXSchema`)
+        :param relaxng: Optional, RelaxNG used to valid the document (see
+                        :meth:`assertXmlValidRelaxNG`)
+
+        This method combines :meth:`assertXmlDocument` with the validation of
+        the document against each of the given schemas. At least one schema
+        is required.
+
+        With an XMLSchema, the document is validated by the parser itself,
+        while it is parsed: there is no second walk through the tree, which
+        makes a difference for large documents. This parser is specific to
+        the schema, so :attr:`xml_parser` is not used in that case.
+
+        .. rubric:: Example
+
+        ::
+
+            # ...
+
+            def test_custom_test(self):
+                data = b\"\"\"<?xml version="1.0" encoding="utf-8"?>
+                <root>
+                    <child id="child1"/>
+                </root>
+                \"\"\"
+                root = self.assertXmlDocumentValid(
+                    data, xschema=self.XSCHEMA
+                )
+
+            # ...
+
+        """
+        if dtd is None and xschema is None and relaxng is None:
+            raise ValueError('No valid schema given.')
+
+        if xschema is None:
+            doc = self.assertXmlDocument(data)
+        else:
+            if not isinstance(xschema, etree.XMLSchema):
+                xschema = _load_xschema(xschema)
+
+            parser = _schema_parser(xschema)
+            try:
+                doc = etree.fromstring(data, parser)
+            except XMLSyntaxError as e:
+                errors = parser.error_log.filter_domains(
+                    etree.ErrorDomains.SCHEMASV)
+                if errors:
+                    raise self.fail(
+                        'Input is not valid according to XMLSchema: %s'
+                        % errors.last_error)
+                raise self.fail('Input is not a valid XML document: %s' % e)
+
+        if dtd is not None:
+            self.assertXmlValidDTD(doc, dtd)
+
+        if relaxng is not None:
+            self.assertXmlValidRelaxNG(doc, relaxng)
+
+        return doc
+
     def assertXmlEquivalentOutputs(
         self,
         data: Union[str, bytes],
@@ -756,6 +1090,11 @@ class XmlTestMixin:
         spaces within nodes and namespaces may be associated to diffrerent
         prefixes, thus requiring only the same URL.
 
+        Both outputs are first compared in their canonical form (C14N 2.0,
+        with stripped text and rewritten prefixes), which is fast. Only when
+        these differ, ``LXMLOutputChecker`` compares them, so its more lenient
+        rules (such as wildcards) still apply.
+
         If a difference is found, an :py:exc:`AssertionError` is raised, with
         the comparison failure's message as error's message.
 
@@ -805,9 +1144,14 @@ class XmlTestMixin:
                 test_case.assertXmlEquivalentOutputs(data, expected)
 
         """
-        checker = LXMLOutputChecker()
+        try:
+            if _canonicalize(data) == _canonicalize_expected(expected):
+                return
+        except (XMLSyntaxError, ValueError, TypeError):
+            # Let the output checker report it
+            pass
 
-        if not checker.check_output(expected, data, PARSE_XML):
+        if not _output_checker.check_output(expected, data, PARSE_XML):
             self.fail('Output are not equivalent:\n'
                       'Given: %s\n'
                       'Expected: %s'
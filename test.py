@@ -1,5 +1,8 @@
 import io
 import os
+import pickle
+import shutil
+import tempfile
 import unittest
 
 from lxml import etree
@@ -9,6 +12,181 @@ from xmlunittest import XmlTestCase
 DEFAULT_NS = 'https://www.w3.org/XML'
 TEST_NS = 'https://docs.python.org/3.4/library/unittest.html'
 
+# Prefix used in XPath expressions, the wrong one, and the arguments that
+# make the assertion use it for the default namespace.
+NS_PREFIX_CASES = (
+    ('ns', 'custom', {}),
+    ('custom', 'ns', {'default_ns_prefix': 'custom'}),
+)
+
+
+# Documents shared by several tests, parsed once in setUpClass.
+# Tests must not modify the parsed trees.
+FIXTURES = {
+    'att_value': b"""<?xml version="1.0" encoding="UTF-8" ?>
+    <root att="value" />""",
+    'text_value': b"""<?xml version="1.0" encoding="UTF-8" ?>
+    <root>text_value</root>""",
+    # Valid and invalid documents for the validation tests
+    'valid_child': b"""<?xml version="1.0" encoding="utf-8"?>
+    <root>
+        <child id="child1"/>
+    </root>
+    """,
+    'invalid_children': b"""<?xml version="1.0" encoding="utf-8"?>
+    <root>
+        <child id="child1"/>
+        <child id="child2"/>
+    </root>
+    """,
+    'ns_sub': b"""<?xml version="1.0" encoding="UTF-8" ?>
+    <root att="exists" xmlns="https://www.w3.org/XML">
+        <sub subAtt="input"/>
+        <sub/>
+    </root>""",
+    'ns_unique_sub': b"""<?xml version="1.0" encoding="UTF-8" ?>
+    <root xmlns="https://www.w3.org/XML">
+        <sub subAtt="unique" id="1" />
+        <sub subAtt="notUnique" id="2"/>
+        <sub subAtt="notUnique" id="3"/>
+        <uniqueSub/>
+    </root>""",
+    'ns_multiple': b"""<?xml version="1.0" encoding="UTF-8" ?>
+    <root xmlns="http://www.w3c.org/XML">
+        <sub subAtt="unique" id="1">unique 1</sub>
+        <sub subAtt="notUnique" id="2">unique 2</sub>
+        <sub subAtt="notUnique" id="3">unique 3</sub>
+        <multiple>twice</multiple>
+        <multiple>twice</multiple>
+    </root>""",
+    'ns_values': b"""<?xml version="1.0" encoding="UTF-8" ?>
+    <root xmlns="http://www.w3c.org/XML">
+        <sub id="1">a</sub>
+        <sub id="2">a</sub>
+        <sub id="3">b</sub>
+        <sub id="4">c</sub>
+    </root>""",
+    'two_ns_sub': ("""<?xml version="1.0" encoding="UTF-8" ?>
+    <root att="exists" xmlns="%s" xmlns:test="%s">
+        <sub subAtt="DEFAULT_ATT" test:subAtt="NODE_NS-ATT"/>
+        <sub/>
+        <test:sub subAtt="NS-NODE_ATT" />
+        <test:sub test:subAtt="NS-NODE_NS-ATT" />
+    </root>""" % (DEFAULT_NS, TEST_NS)).encode('utf-8'),
+    'two_ns_unique_sub': ("""<?xml version="1.0" encoding="UTF-8" ?>
+    <root xmlns="%s" xmlns:test="%s">
+        <sub subAtt="unique" id="1" />
+        <sub subAtt="notUnique" id="2"/>
+        <sub subAtt="notUnique" id="3"/>
+        <test:sub subAtt="notUnique" id="2"/>
+        <test:sub subAtt="notUnique" id="3"/>
+        <sub test:subAtt="unique" id="1" />
+        <uniqueSub/>
+        <test:uniqueSub/>
+    </root>""" % (DEFAULT_NS, TEST_NS)).encode('utf-8'),
+    'two_ns_multiple': ("""<?xml version="1.0" encoding="UTF-8" ?>
+    <root xmlns="%s" xmlns:test="%s">
+        <sub subAtt="unique" id="1">unique 1</sub>
+        <sub subAtt="notUnique" id="2">unique 2</sub>
+        <sub subAtt="notUnique" id="3">unique 3</sub>
+        <test:sub subAtt="unique" id="1">unique 1</test:sub>
+        <test:sub subAtt="notUnique" id="2">unique 2</test:sub>
+        <test:sub subAtt="notUnique" id="3">unique 3</test:sub>
+        <multiple>twice</multiple>
+        <multiple>twice</multiple>
+        <test:multiple>twice</test:multiple>
+        <test:multiple>twice</test:multiple>
+    </root>""" % (DEFAULT_NS, TEST_NS)).encode('utf-8'),
+    'two_ns_values': ("""<?xml version="1.0" encoding="UTF-8" ?>
+    <root xmlns="%s" xmlns:test="%s">
+        <sub test:id="1">a</sub>
+        <sub id="2">a</sub>
+        <sub id="3">b</sub>
+        <sub id="4">c</sub>
+        <test:sub>ns-a</test:sub>
+    </root>""" % (DEFAULT_NS, TEST_NS)).encode('utf-8'),
+}
+
+
+class FrozenElement(etree.ElementBase):
+    """Element of a shared document, that tests must not modify.
+
+    Only the mutating methods are blocked: ``etree.SubElement`` and the
+    ``text``, ``tail`` and ``tag`` properties still change the element.
+    """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('Shared test documents are read-only')
+
+    append = extend = insert = remove = clear = set = _read_only
+    addnext = addprevious = replace = _read_only
+    __setitem__ = __delitem__ = _read_only
+
+
+# Shared documents do not use IDs, and tests never look at the
+# indentation between elements.
+FIXTURES_PARSER = etree.XMLParser(collect_ids=False, remove_blank_text=True)
+FIXTURES_PARSER.set_element_class_lookup(
+    etree.ElementDefaultClassLookup(element=FrozenElement))
+
+
+# Schemas of the validation tests, as sources and as compiled objects
+DTD_SOURCE = """<!ELEMENT root (child)>
+<!ELEMENT child EMPTY>
+<!ATTLIST child id ID #REQUIRED>
+"""
+XSCHEMA_SOURCE = b"""<?xml version="1.0" encoding="utf-8"?>
+<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <xsd:element name="root">
+        <xsd:complexType>
+            <xsd:sequence>
+                <xsd:element name="child" minOccurs="1" maxOccurs="1">
+                    <xsd:complexType>
+                        <xsd:simpleContent>
+                            <xsd:extension base="xsd:string">
+                                <xsd:attribute name="id" type="xsd:string" use="required" />
+                            </xsd:extension>
+                        </xsd:simpleContent>
+                    </xsd:complexType>
+                </xsd:element>
+            </xsd:sequence>
+        </xsd:complexType>
+    </xsd:element>
+</xsd:schema>
+"""
+RELAXNG_SOURCE = b"""<?xml version="1.0" encoding="utf-8"?>
+<rng:element name="root" xmlns:rng="http://relaxng.org/ns/structure/1.0">
+    <rng:element name="child">
+        <rng:attribute name="id">
+            <rng:text />
+        </rng:attribute>
+    </rng:element>
+</rng:element>
+"""
+
+
+def supports(build):
+    """Return whether libxml2 can build the minimal schema of ``build``."""
+    try:
+        build()
+    except etree.LxmlError:
+        return False
+    return True
+
+
+# Probe libxml2 with minimal schemas, so an error in the schemas of the
+# tests is reported instead of skipping them.
+HAS_DTD = supports(lambda: etree.DTD(io.StringIO('<!ELEMENT a EMPTY>')))
+HAS_XSCHEMA = supports(lambda: etree.XMLSchema(etree.XML(
+    b'<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">'
+    b'<xsd:element name="a"/></xsd:schema>')))
+HAS_RELAXNG = supports(lambda: etree.RelaxNG(etree.XML(
+    b'<element name="a" xmlns="http://relaxng.org/ns/structure/1.0">'
+    b'<empty/></element>')))
+
+DTD_SCHEMA = etree.DTD(io.StringIO(DTD_SOURCE)) if HAS_DTD else None
+XSCHEMA = etree.XMLSchema(etree.XML(XSCHEMA_SOURCE)) if HAS_XSCHEMA else None
+RELAXNG = etree.RelaxNG(etree.XML(RELAXNG_SOURCE)) if HAS_RELAXNG else None
+
 
 class TestXmlTestCase(unittest.TestCase):
     """Test the XmlTestCase.
@@ -20,6 +198,48 @@ class TestXmlTestCase(unittest.TestCase):
     code. For each successful case a related error case is tested too.
 
     """
+    @classmethod
+    def setUpClass(cls):
+        # Assertions do not depend on the test method, one instance is enough
+        cls.test_case = XmlTestCase()
+        cls.roots = {
+            name: etree.fromstring(data, FIXTURES_PARSER)
+            for name, data in FIXTURES.items()
+        }
+        # Schema files for the filename variants of the validation tests
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.dtd_filename = os.path.join(cls.tmp_dir, 'schema.dtd')
+        with open(cls.dtd_filename, 'w') as dtd_file:
+            dtd_file.write(DTD_SOURCE)
+        cls.xschema_filename = os.path.join(cls.tmp_dir, 'schema.xsd')
+        with open(cls.xschema_filename, 'wb') as xschema_file:
+            xschema_file.write(XSCHEMA_SOURCE)
+        cls.relaxng_filename = os.path.join(cls.tmp_dir, 'schema.rng')
+        with open(cls.relaxng_filename, 'wb') as relaxng_file:
+            relaxng_file.write(RELAXNG_SOURCE)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_shared_documents_read_only(self):
+        """Asserts the shared documents can't be modified by mistake."""
+        root = self.roots['valid_child']
+        child = root[0]
+        new = etree.Element('new')
+
+        for mutate in (lambda: root.append(new),
+                       lambda: root.remove(child),
+                       lambda: root.replace(child, new),
+                       lambda: child.addnext(new),
+                       lambda: child.addprevious(new),
+                       lambda: child.set('id', 'other')):
+            with self.assertRaises(TypeError):
+                mutate()
+
+        self.assertEqual(len(root), 1)
+        self.assertEqual(child.get('id'), 'child1')
+
     def test_assertXmlDocument(self):
         """Asserts assertXmlDocument raises when data is invalid.
 
@@ -28,7 +248,7 @@ class TestXmlTestCase(unittest.TestCase):
         the XML declaration nor any doctype declaration.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlDocument')
+        test_case = self.test_case
         data = b"""<root/>"""
 
         root = test_case.assertXmlDocument(data)
@@ -39,7 +259,7 @@ class TestXmlTestCase(unittest.TestCase):
 
     def test_assertXmlDocument_with_encoding(self):
         """Asserts assertXmlDocument works with utf-8 and other encoding."""
-        test_case = XmlTestCase(methodName='assertXmlDocument')
+        test_case = self.test_case
 
         # utf-8
         data = """<?xml version="1.0" encoding="UTF-8" ?>
@@ -63,6 +283,21 @@ class TestXmlTestCase(unittest.TestCase):
         with self.assertRaises(test_case.failureException):
             test_case.assertXpathsExist(root, ['//something'])
 
+    def test_assertXmlDocument_xml_parser(self):
+        """Asserts assertXmlDocument uses the test case's xml_parser."""
+        class CustomTestCase(XmlTestCase):
+            xml_parser = etree.XMLParser(remove_comments=True)
+
+        test_case = CustomTestCase(methodName='assertXmlDocument')
+        root = test_case.assertXmlDocument(b'<root><!-- c --><sub/></root>')
+        self.assertEqual(len(root), 1)
+
+        root = test_case.assertXmlPartial(b'<!-- c --><sub/>')
+        self.assertEqual(len(root), 1)
+
+        with self.assertRaises(test_case.failureException):
+            test_case.assertXmlDocument(b'<root>')
+
     # -------------------------------------------------------------------------
 
     def test_assertXmlPartial(self):
@@ -72,7 +307,7 @@ class TestXmlTestCase(unittest.TestCase):
         string and returns a valid XML document, or raise an error.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlPartial')
+        test_case = self.test_case
         data = b"""<partial>1</partial>
         <partial>2</partial>"""
 
@@ -81,6 +316,13 @@ class TestXmlTestCase(unittest.TestCase):
 
         self.assertEqual(root.tag, test_case.default_partial_tag)
         self.assertEqual(len(root), 2)
+        self.assertEqual(root.text, None)
+
+        # Same partial document, as a str
+        root = test_case.assertXmlPartial(
+            '<partial>é</partial><partial>2</partial>')
+        self.assertEqual(len(root), 2)
+        self.assertEqual(root[0].text, 'é')
 
         with self.assertRaises(test_case.failureException):
             test_case.assertXmlPartial(b'<invalidChar>&</invalidChar>')
@@ -98,7 +340,7 @@ class TestXmlTestCase(unittest.TestCase):
         method the root element's tag name.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlPartial')
+        test_case = self.test_case
         data = b"""<partial>1</partial>
         <partial>2</partial>"""
 
@@ -129,7 +371,7 @@ class TestXmlTestCase(unittest.TestCase):
         reference this namespace, and thus it can be tested.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlNamespace')
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
         <root xmlns:ns="uri"/>"""
 
@@ -146,39 +388,26 @@ class TestXmlTestCase(unittest.TestCase):
     # -------------------------------------------------------------------------
 
     def test_assertXmlHasAttribute(self):
-        """Asserts assertXmlHasAttribute raises when attribute does not exist.
+        """Asserts assertXmlHasAttribute raises when attribute is invalid.
 
         Method assertXmlHasAttribute can test if attribute exists or not, and
-        more - see other tests for that.
-
-        """
-        test_case = XmlTestCase(methodName='assertXmlHasAttribute')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root att="value" />"""
-
-        root = test_case.assertXmlDocument(data)
-        test_case.assertXmlHasAttribute(root, 'att')
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlHasAttribute(root, 'no_att')
-
-    def test_assertXmlHasAttribute_value(self):
-        """Asserts assertXmlHasAttribute raises when value is invalid.
-
-        With optional argument `expected_value`, assertXmlHasAttribute can
-        assert if attribute's value is the given expected value.
+        with optional argument `expected_value`, if attribute's value is the
+        given expected value.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlHasAttribute')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root att="value" />"""
+        test_case = self.test_case
+        root = self.roots['att_value']
 
-        root = test_case.assertXmlDocument(data)
-        test_case.assertXmlHasAttribute(root, 'att', expected_value='value')
+        for kwargs in ({}, {'expected_value': 'value'}):
+            with self.subTest(**kwargs):
+                test_case.assertXmlHasAttribute(root, 'att', **kwargs)
 
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlHasAttribute(root, 'att',
-                                            expected_value='invalid')
+        for attribute, kwargs in (('no_att', {}),
+                                  ('no_att', {'expected_value': 'value'}),
+                                  ('att', {'expected_value': 'invalid'})):
+            with self.subTest(attribute=attribute, **kwargs):
+                with self.assertRaises(test_case.failureException):
+                    test_case.assertXmlHasAttribute(root, attribute, **kwargs)
 
     def test_assertXmlHasAttribute_values(self):
         """Asserts assertXmlHasAttribute raises when value is invalid.
@@ -187,7 +416,7 @@ class TestXmlTestCase(unittest.TestCase):
         assert if attribute's value is one of the given expected values.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlHasAttribute')
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
         <root>
             <child att="1"/>
@@ -213,11 +442,8 @@ class TestXmlTestCase(unittest.TestCase):
         an XML Element.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlNode')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root>text_value</root>"""
-
-        root = test_case.assertXmlDocument(data)
+        test_case = self.test_case
+        root = self.roots['text_value']
         test_case.assertXmlNode(root)
 
         with self.assertRaises(test_case.failureException):
@@ -227,79 +453,56 @@ class TestXmlTestCase(unittest.TestCase):
         with self.assertRaises(test_case.failureException):
             test_case.assertXmlNode('<root>text_value</root>')
 
-    def test_assertXmlNode_tag(self):
-        """Asserts assertXmlNode raises when node is invalid.
-
-        Method assertXmlNode raise if node has not the expected tag name.
-
-        """
-        test_case = XmlTestCase(methodName='assertXmlNode')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root>text_value</root>"""
-
-        root = test_case.assertXmlDocument(data)
-
-        test_case.assertXmlNode(root, tag='root')
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlNode(root, tag='noRoot')
-
-    def test_assertXmlNode_text(self):
+    def test_assertXmlNode_expected(self):
         """Asserts assertXmlNode raises when node is invalid.
 
-        Method assertXmlNode raise if node has not the expected text value.
+        Method assertXmlNode raises if node has not the expected tag name,
+        the expected text value, or a text value in the list of valid values.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlNode')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root>text_value</root>"""
-
-        root = test_case.assertXmlDocument(data)
-
-        test_case.assertXmlNode(root, text='text_value')
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlNode(root, text='invalid')
-
-    def test_assertXmlNode_tag_text(self):
-        """Asserts assertXmlNode raises when node is invalid.
-
-        Method assertXmlNode raises if node has not the expected tag name
-        or the expected text value.
-
-        """
-        test_case = XmlTestCase(methodName='assertXmlNode')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root>text_value</root>"""
+        test_case = self.test_case
+        root = self.roots['text_value']
+
+        valid = ({'tag': 'root'},
+                 {'text': 'text_value'},
+                 {'tag': 'root', 'text': 'text_value'},
+                 {'text_in': ['text_value', 'ok']})
+        invalid = ({'tag': 'noRoot'},
+                   {'text': 'invalid'},
+                   {'tag': 'root', 'text': 'invalid'},
+                   {'tag': 'noRoot', 'text': 'text_value'},
+                   {'tag': 'noRoot', 'text': 'invalid'},
+                   {'text_in': ['invalid', 'ok']})
+
+        for kwargs in valid:
+            with self.subTest(**kwargs):
+                test_case.assertXmlNode(root, **kwargs)
+
+        for kwargs in invalid:
+            with self.subTest(**kwargs):
+                with self.assertRaises(test_case.failureException):
+                    test_case.assertXmlNode(root, **kwargs)
 
-        root = test_case.assertXmlDocument(data)
-
-        test_case.assertXmlNode(root, tag='root', text='text_value')
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlNode(root, tag='root', text='invalid')
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlNode(root, tag='noRoot', text='text_value')
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlNode(root, tag='noRoot', text='invalid')
-
-    def test_assertXmlNode_text_in(self):
-        """Asserts assertXmlNode raises when node is invalid.
-
-        Method assertXmlNode raises if node's text value is not in the list
-        of valid values.
-
-        """
-        test_case = XmlTestCase(methodName='assertXmlNode')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root>valid</root>"""
-
-        root = test_case.assertXmlDocument(data)
+    # -------------------------------------------------------------------------
 
-        test_case.assertXmlNode(root, text_in=['valid', 'ok'])
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlNode(root, text_in=['invalid', 'ok'])
+    def test_build_xpath_expression_cached(self):
+        """Asserts compiled XPath expressions are reused between calls."""
+        test_case = self.test_case
+        root = test_case.assertXmlDocument(b'<root><sub/></root>')
+        other = test_case.assertXmlDocument(b'<other><sub/></other>')
+
+        expression = test_case.build_xpath_expression(root, './sub')
+        self.assertIs(
+            test_case.build_xpath_expression(other, './sub'), expression)
+        self.assertEqual(
+            list(test_case.build_xpath_expressions(root, ['./sub'])),
+            [expression])
+
+        # Another namespace map requires another expression
+        ns_root = test_case.assertXmlDocument(
+            b'<root xmlns="%s"><sub/></root>' % DEFAULT_NS.encode('utf-8'))
+        self.assertIsNot(
+            test_case.build_xpath_expression(ns_root, './sub'), expression)
 
     # -------------------------------------------------------------------------
 
@@ -310,7 +513,7 @@ class TestXmlTestCase(unittest.TestCase):
         one result.
 
         """
-        test_case = XmlTestCase(methodName='assertXpathsExist')
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
         <root att="exists">
             <sub subAtt="input"/>
@@ -330,85 +533,32 @@ class TestXmlTestCase(unittest.TestCase):
         with self.assertRaises(test_case.failureException):
             test_case.assertXpathsExist(root, ['./sub[@subAtt="invalid"]'])
 
-    def test_assertXpathsExist_namespaces_default_prefix(self):
-        """Asserts assertXpathsExist works with default namespaces."""
-        test_case = XmlTestCase(methodName='assertXpathsExist')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root att="exists" xmlns="https://www.w3.org/XML">
-            <sub subAtt="input"/>
-            <sub/>
-        </root>"""
-
-        root = test_case.assertXmlDocument(data)
-        xpaths = ['@att', './ns:sub', './ns:sub[@subAtt="input"]']
-        test_case.assertXpathsExist(root, xpaths)
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsExist(root, ['@invalidAtt'])
-
-        with self.assertRaises(test_case.failureException):
-            # Without the namespace prefix, it does not work
-            test_case.assertXpathsExist(root, ['./sub'])
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsExist(root, ['./ns:invalidChild'])
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsExist(root, ['./ns:sub[@subAtt="invalid"]'])
-
-    def test_assertXpathsExist_namespaces_custom_prefix(self):
-        """Asserts assertXpathsExist works with custom default namespaces."""
-        test_case = XmlTestCase(methodName='assertXpathsExist')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root att="exists" xmlns="https://www.w3.org/XML">
-            <sub subAtt="input"/>
-            <sub/>
-        </root>"""
-
-        root = test_case.assertXmlDocument(data)
-        # With a custom default prefix
-        xpaths = ['@att', './custom:sub', './custom:sub[@subAtt="input"]']
-        test_case.assertXpathsExist(root, xpaths, default_ns_prefix='custom')
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsExist(root,
-                                        ['@invalidAtt'],
-                                        default_ns_prefix='custom')
-
-        with self.assertRaises(test_case.failureException):
-            # Without the namespace prefix, it does not work
-            test_case.assertXpathsExist(root,
-                                        ['./sub'],
-                                        default_ns_prefix='custom')
-
-        with self.assertRaises(test_case.failureException):
-            # With the wrong namespace it does not work either
-            test_case.assertXpathsExist(root,
-                                        ['./ns:sub'],
-                                        default_ns_prefix='custom')
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsExist(root,
-                                        ['./custom:invalidChild'],
-                                        default_ns_prefix='custom')
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsExist(root,
-                                        ['./custom:sub[@subAtt="invalid"]'],
-                                        default_ns_prefix='custom')
+    def test_assertXpathsExist_namespaces_prefix(self):
+        """Asserts assertXpathsExist works with default and custom prefix."""
+        test_case = self.test_case
+        root = self.roots['ns_sub']
+
+        for prefix, other, kwargs in NS_PREFIX_CASES:
+            with self.subTest(default_ns_prefix=prefix):
+                xpaths = ['@att',
+                          './%s:sub' % prefix,
+                          './%s:sub[@subAtt="input"]' % prefix]
+                test_case.assertXpathsExist(root, xpaths, **kwargs)
+
+                for xpath in ['@invalidAtt',
+                              # Without the namespace prefix, it does not work
+                              './sub',
+                              # With the wrong namespace it does not work either
+                              './%s:sub' % other,
+                              './%s:invalidChild' % prefix,
+                              './%s:sub[@subAtt="invalid"]' % prefix]:
+                    with self.assertRaises(test_case.failureException):
+                        test_case.assertXpathsExist(root, [xpath], **kwargs)
 
     def test_assertXpathsExist_namespaces(self):
         """Asserts assertXpathsExist works with namespaces."""
-        test_case = XmlTestCase(methodName='assertXpathsExist')
-        data = """<?xml version="1.0" encoding="UTF-8" ?>
-        <root att="exists" xmlns="%s" xmlns:test="%s">
-            <sub subAtt="DEFAULT_ATT" test:subAtt="NODE_NS-ATT"/>
-            <sub/>
-            <test:sub subAtt="NS-NODE_ATT" />
-            <test:sub test:subAtt="NS-NODE_NS-ATT" />
-        </root>""" % (DEFAULT_NS, TEST_NS)
-
-        root = test_case.assertXmlDocument(data.encode('utf-8'))
+        test_case = self.test_case
+        root = self.roots['two_ns_sub']
         xpaths = [
             # attribute without namespace
             '@att',
@@ -450,7 +600,7 @@ class TestXmlTestCase(unittest.TestCase):
         expressions does not select one and exactly one result.
 
         """
-        test_case = XmlTestCase(methodName='assertXpathsOnlyOne')
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
         <root>
             <sub subAtt="unique" id="1" />
@@ -470,77 +620,98 @@ class TestXmlTestCase(unittest.TestCase):
         with self.assertRaises(test_case.failureException):
             test_case.assertXpathsOnlyOne(root, ['./sub[@subAtt="notUnique"]'])
 
-    def test_assertXpathsOnlyOne_namespaces_default_prefix(self):
-        """Asserts assertXpathsOnlyOne works with default namespace prefix"""
-        test_case = XmlTestCase(methodName='assertXpathsOnlyOne')
+    def test_assertXpathsOnlyOne_attributes_text(self):
+        """Asserts assertXpathsOnlyOne counts attributes and text nodes."""
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="https://www.w3.org/XML">
-            <sub subAtt="unique" id="1" />
-            <sub subAtt="notUnique" id="2"/>
-            <sub subAtt="notUnique" id="3"/>
-            <uniqueSub/>
+        <root att="value">
+            <sub id="1">text</sub>
+            <sub id="2"/>
         </root>"""
-
         root = test_case.assertXmlDocument(data)
-        unique_for_each = ['./ns:uniqueSub',
-                           './ns:sub[@subAtt="unique"]']
-        test_case.assertXpathsOnlyOne(root, unique_for_each)
+
+        test_case.assertXpathsOnlyOne(root, ['@att',
+                                             './sub/text()',
+                                             './sub[@id="2"]/@id'])
 
         with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsOnlyOne(root, ['./ns:invalidChild'])
+            test_case.assertXpathsOnlyOne(root, ['./sub/@id'])
 
         with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsOnlyOne(root, ['./ns:sub[@subAtt="notUnique"]'])
+            test_case.assertXpathsOnlyOne(root, ['@invalidAtt'])
 
-    def test_assertXpathsOnlyOne_namespaces_custom_prefix(self):
-        """Asserts assertXpathsOnlyOne works with custom namespace prefix"""
-        test_case = XmlTestCase(methodName='assertXpathsOnlyOne')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="https://www.w3.org/XML">
-            <sub subAtt="unique" id="1" />
-            <sub subAtt="notUnique" id="2"/>
-            <sub subAtt="notUnique" id="3"/>
-            <uniqueSub/>
-        </root>"""
+        with self.assertRaises(test_case.failureException):
+            test_case.assertXpathsOnlyOne(root, ['./sub[@id="2"]/text()'])
 
-        root = test_case.assertXmlDocument(data)
-        unique_for_each = ['./custom:uniqueSub',
-                           './custom:sub[@subAtt="unique"]']
-        test_case.assertXpathsOnlyOne(root,
-                                      unique_for_each,
-                                      default_ns_prefix='custom')
+    def test_assertXpathsOnlyOne_message(self):
+        """Asserts assertXpathsOnlyOne failure message shows the element."""
+        test_case = self.test_case
+        root = test_case.assertXmlDocument(
+            '<root><sub>é</sub><sub/></root>'.encode('utf-8'))
 
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsOnlyOne(root,
-                                          ['./custom:invalidChild'],
-                                          default_ns_prefix='custom')
+        with self.assertRaises(test_case.failureException) as context:
+            test_case.assertXpathsOnlyOne(root, ['./sub'])
 
-        with self.assertRaises(test_case.failureException):
-            # Wrong namespace: the node exists but not with this namespace.
-            # That's why namespaces exist after all.
-            test_case.assertXpathsOnlyOne(root,
-                                          ['./ns:uniqueSub'],
-                                          default_ns_prefix='custom')
+        message = str(context.exception)
+        self.assertIn('Too many results found (2)', message)
+        self.assertIn('<sub>é</sub>', message)
+        self.assertNotIn("b'", message)
 
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsOnlyOne(root, ['./custom:sub[@subAtt="notUnique"]'])
+    def test_failure_message_lazy(self):
+        """Asserts the element is serialized only when a message is shown."""
+        calls = []
+
+        class CustomTestCase(XmlTestCase):
+            def format_node(self, node):
+                calls.append(node)
+                return super().format_node(node)
+
+        test_case = CustomTestCase(methodName='assertXpathsExist')
+        root = test_case.assertXmlDocument(b'<root><sub/></root>')
+
+        with self.assertRaises(test_case.failureException) as context:
+            test_case.assertXpathsExist(root, ['./invalidChild'])
+        self.assertEqual(calls, [])
+
+        self.assertIn('<sub/>', str(context.exception))
+        self.assertEqual(calls, [root])
+
+    def test_failure_message_pickle(self):
+        """Asserts a failure can be pickled, with its message as a string."""
+        test_case = self.test_case
+        root = test_case.assertXmlDocument(b'<root><sub/></root>')
+
+        with self.assertRaises(test_case.failureException) as context:
+            test_case.assertXpathsExist(root, ['./invalidChild'])
+
+        error = pickle.loads(pickle.dumps(context.exception))
+        self.assertIsInstance(error.args[0], str)
+        self.assertEqual(str(error), str(context.exception))
+
+    def test_assertXpathsOnlyOne_namespaces_prefix(self):
+        """Asserts assertXpathsOnlyOne works with default and custom prefix"""
+        test_case = self.test_case
+        root = self.roots['ns_unique_sub']
+
+        for prefix, other, kwargs in NS_PREFIX_CASES:
+            with self.subTest(default_ns_prefix=prefix):
+                unique_for_each = ['./%s:uniqueSub' % prefix,
+                                   './%s:sub[@subAtt="unique"]' % prefix]
+                test_case.assertXpathsOnlyOne(root, unique_for_each, **kwargs)
+
+                for xpath in ['./%s:invalidChild' % prefix,
+                              # Wrong namespace: the node exists but not with
+                              # this namespace. That's why namespaces exist
+                              # after all.
+                              './%s:uniqueSub' % other,
+                              './%s:sub[@subAtt="notUnique"]' % prefix]:
+                    with self.assertRaises(test_case.failureException):
+                        test_case.assertXpathsOnlyOne(root, [xpath], **kwargs)
 
     def test_assertXpathsOnlyOne_namespaces(self):
         """Asserts assertXpathsOnlyOne works with namespace"""
-        test_case = XmlTestCase(methodName='assertXpathsOnlyOne')
-        data = """<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="%s" xmlns:test="%s">
-            <sub subAtt="unique" id="1" />
-            <sub subAtt="notUnique" id="2"/>
-            <sub subAtt="notUnique" id="3"/>
-            <test:sub subAtt="notUnique" id="2"/>
-            <test:sub subAtt="notUnique" id="3"/>
-            <sub test:subAtt="unique" id="1" />
-            <uniqueSub/>
-            <test:uniqueSub/>
-        </root>""" % (DEFAULT_NS, TEST_NS)
-
-        root = test_case.assertXmlDocument(data.encode('utf-8'))
+        test_case = self.test_case
+        root = self.roots['two_ns_unique_sub']
         unique_for_each = ['./ns:sub[@subAtt="unique"]',
                            './ns:sub[@test:subAtt="unique"]',
                            './ns:uniqueSub',
@@ -568,7 +739,7 @@ class TestXmlTestCase(unittest.TestCase):
         select does not returns unique results.
 
         """
-        test_case = XmlTestCase(methodName='assertXpathsUniqueValue')
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
         <root>
             <sub subAtt="unique" id="1">unique 1</sub>
@@ -588,71 +759,29 @@ class TestXmlTestCase(unittest.TestCase):
         with self.assertRaises(test_case.failureException):
             test_case.assertXpathsUniqueValue(root, ['./multiple/text()'])
 
-    def test_assertXpathsUniqueValue_namespaces_default_prefix(self):
-        """Asserts assertXpathsUniqueValue works with default namespace prefix."""
-        test_case = XmlTestCase(methodName='assertXpathsUniqueValue')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="http://www.w3c.org/XML">
-            <sub subAtt="unique" id="1">unique 1</sub>
-            <sub subAtt="notUnique" id="2">unique 2</sub>
-            <sub subAtt="notUnique" id="3">unique 3</sub>
-            <multiple>twice</multiple>
-            <multiple>twice</multiple>
-        </root>"""
-        root = test_case.assertXmlDocument(data)
-
-        test_case.assertXpathsUniqueValue(root,
-                                          ['./ns:sub/@id', './ns:sub/text()'])
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsUniqueValue(root, ['./ns:sub/@subAtt'])
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsUniqueValue(root, ['./ns:multiple/text()'])
-
-    def test_assertXpathsUniqueValue_namespaces_custom_prefix(self):
-        """Asserts assertXpathsUniqueValue works with custom namespace prefix.
+    def test_assertXpathsUniqueValue_namespaces_prefix(self):
+        """Asserts assertXpathsUniqueValue works with default and custom prefix.
         """
-        test_case = XmlTestCase(methodName='assertXpathsUniqueValue')
-        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="http://www.w3c.org/XML">
-            <sub subAtt="unique" id="1">unique 1</sub>
-            <sub subAtt="notUnique" id="2">unique 2</sub>
-            <sub subAtt="notUnique" id="3">unique 3</sub>
-            <multiple>twice</multiple>
-            <multiple>twice</multiple>
-        </root>"""
-        root = test_case.assertXmlDocument(data)
-
-        test_case.assertXpathsUniqueValue(root,
-                                          ['./custom:sub/@id',
-                                           './custom:sub/text()'],
-                                          default_ns_prefix='custom')
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsUniqueValue(root, ['./custom:sub/@subAtt'])
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXpathsUniqueValue(root,
-                                              ['./custom:multiple/text()'])
+        test_case = self.test_case
+        root = self.roots['ns_multiple']
+
+        for prefix, other, kwargs in NS_PREFIX_CASES:
+            with self.subTest(default_ns_prefix=prefix):
+                test_case.assertXpathsUniqueValue(root,
+                                                  ['./%s:sub/@id' % prefix,
+                                                   './%s:sub/text()' % prefix],
+                                                  **kwargs)
+
+                for xpath in ['./%s:sub/@subAtt' % prefix,
+                              './%s:multiple/text()' % prefix]:
+                    with self.assertRaises(test_case.failureException):
+                        test_case.assertXpathsUniqueValue(root, [xpath],
+                                                          **kwargs)
 
     def test_assertXpathsUniqueValue_namespaces(self):
         """Asserts assertXpathsUniqueValue works with namespace."""
-        test_case = XmlTestCase(methodName='assertXpathsUniqueValue')
-        data = """<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="%s" xmlns:test="%s">
-            <sub subAtt="unique" id="1">unique 1</sub>
-            <sub subAtt="notUnique" id="2">unique 2</sub>
-            <sub subAtt="notUnique" id="3">unique 3</sub>
-            <test:sub subAtt="unique" id="1">unique 1</test:sub>
-            <test:sub subAtt="notUnique" id="2">unique 2</test:sub>
-            <test:sub subAtt="notUnique" id="3">unique 3</test:sub>
-            <multiple>twice</multiple>
-            <multiple>twice</multiple>
-            <test:multiple>twice</test:multiple>
-            <test:multiple>twice</test:multiple>
-        </root>""" % (DEFAULT_NS, TEST_NS)
-        root = test_case.assertXmlDocument(data.encode('utf-8'))
+        test_case = self.test_case
+        root = self.roots['two_ns_multiple']
 
         # Note: the default namespace and test namespace create different nodes
         # so their values and attributes are *not* in the same group.
@@ -695,7 +824,7 @@ class TestXmlTestCase(unittest.TestCase):
         is in the expected values.
 
         """
-        test_case = XmlTestCase(methodName='assertXpathValues')
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
         <root>
             <sub id="1">a</sub>
@@ -705,23 +834,30 @@ class TestXmlTestCase(unittest.TestCase):
         </root>"""
         root = test_case.assertXmlDocument(data)
 
-        test_case.assertXpathValues(root, './sub/@id', ['1', '2', '3', '4'])
-        test_case.assertXpathValues(root, './sub/text()', ['a', 'b', 'c'])
+        test_case.assertXpathValues(root, './sub/@id', ('1', '2', '3', '4'))
+        test_case.assertXpathValues(root, './sub/text()', ('a', 'b', 'c'))
 
         # This pass because the XPath expression returns 0 element.
         # So "all" the existing values are one of the expected values.
         # One should use assertXpathsExist instead
-        test_case.assertXpathValues(root, './absentSub/@id', ['1', '2'])
+        test_case.assertXpathValues(root, './absentSub/@id', ('1', '2'))
 
         with self.assertRaises(test_case.failureException):
-            test_case.assertXpathValues(root, './sub/@id', ['1', '2'])
+            test_case.assertXpathValues(root, './sub/@id', ('1', '2'))
 
         with self.assertRaises(test_case.failureException):
-            test_case.assertXpathValues(root, './sub/text()', ['a', 'b'])
+            test_case.assertXpathValues(root, './sub/text()', ('a', 'b'))
 
-    def test_assertXpathValues_namespaces_default_prefix(self):
-        """Asserts assertXpathValues works with default namespaces."""
-        test_case = XmlTestCase(methodName='assertXpathValues')
+        # A single string is searched with ``in``, i.e. for substrings
+        test_case.assertXpathValues(root, './sub/@id', '1234')
+        test_case.assertXpathValues(root, './sub/text()', 'abc')
+
+        with self.assertRaises(test_case.failureException):
+            test_case.assertXpathValues(root, './sub/@id', '123')
+
+    def test_assertXpathValuesBatch(self):
+        """Asserts assertXpathValuesBatch checks each XPath's values."""
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
         <root xmlns="http://www.w3c.org/XML">
             <sub id="1">a</sub>
@@ -731,207 +867,230 @@ class TestXmlTestCase(unittest.TestCase):
         </root>"""
         root = test_case.assertXmlDocument(data)
 
-        test_case.assertXpathValues(root, './ns:sub/@id', ['1', '2', '3', '4'])
-        test_case.assertXpathValues(root, './ns:sub/text()', ['a', 'b', 'c'])
+        test_case.assertXpathValuesBatch(root, [
+            ('./ns:sub/@id', ['1', '2', '3', '4']),
+            ('./ns:sub/text()', ['a', 'b', 'c']),
+            ('./ns:absentSub/@id', ['1', '2']),
+        ])
+        test_case.assertXpathValuesBatch(root, [
+            ('./custom:sub/@id', ['1', '2', '3', '4']),
+            ('./custom:sub[@id=$id]/text()', ['b']),
+        ], default_ns_prefix='custom', id='3')
+
+        with self.assertRaises(test_case.failureException):
+            test_case.assertXpathValuesBatch(root, [
+                ('./ns:sub/@id', ['1', '2', '3', '4']),
+                ('./ns:sub/text()', ['a', 'b']),
+            ])
+
+        with self.assertRaises(test_case.failureException):
+            # Invalid expressions fail before any evaluation
+            test_case.assertXpathValuesBatch(root, [
+                ('./ns:sub/@id', ['1', '2', '3', '4']),
+                ('./ns:sub/[', ['a', 'b', 'c']),
+            ])
+
+    def test_assertXpath_compiled(self):
+        """Asserts XPath assertions accept compiled XPath expressions."""
+        test_case = self.test_case
+        data = b"""<?xml version="1.0" encoding="UTF-8" ?>
+        <root xmlns="%s">
+            <sub id="1">a</sub>
+            <sub id="2">a</sub>
+            <uniqueSub/>
+        </root>""" % DEFAULT_NS.encode('utf-8')
+        root = test_case.assertXmlDocument(data)
+
+        # Compiled expressions come with their own namespaces
+        namespaces = {'x': DEFAULT_NS}
+        sub = etree.XPath('./x:sub', namespaces=namespaces)
+        sub_id = etree.XPath('./x:sub/@id', namespaces=namespaces)
+        sub_text = etree.XPath('./x:sub/text()', namespaces=namespaces)
+        unique = etree.XPath('./x:uniqueSub', namespaces=namespaces)
+
+        test_case.assertXpathsExist(root, [sub, './ns:sub'])
+        test_case.assertXpathsOnlyOne(root, [unique])
+        test_case.assertXpathsUniqueValue(root, [sub_id])
+        test_case.assertXpathValues(root, sub_text, ['a'])
+        test_case.assertXpathValuesBatch(root, [(sub_id, ['1', '2']),
+                                                ('./ns:sub/text()', ['a'])])
+
+        with self.assertRaises(test_case.failureException):
+            test_case.assertXpathsOnlyOne(root, [sub])
 
         with self.assertRaises(test_case.failureException):
-            # @id in ['3', '4'] is missing
-            test_case.assertXpathValues(root, './ns:sub/@id', ['1', '2'])
+            test_case.assertXpathsUniqueValue(root, [sub_text])
 
         with self.assertRaises(test_case.failureException):
-            # text() == c is missing
-            test_case.assertXpathValues(root, './ns:sub/text()', ['a', 'b'])
+            test_case.assertXpathValues(root, sub_id, ['1'])
 
         with self.assertRaises(test_case.failureException):
-            # Unknown namespace
-            test_case.assertXpathValues(root, './custom:sub/@id', ['1', '2', '3', '4'])
+            # The "x" prefix is unknown to the node's namespaces
+            test_case.assertXpathsExist(root, ['./x:sub'])
 
-    def test_assertXpathValues_namespaces_custom_prefix(self):
-        """Asserts assertXpathValues works with custom namespaces."""
-        test_case = XmlTestCase(methodName='assertXpathValues')
+    def test_assertXpathValues_variables(self):
+        """Asserts XPath assertions accept values for XPath variables."""
+        test_case = self.test_case
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="http://www.w3c.org/XML">
+        <root>
             <sub id="1">a</sub>
             <sub id="2">a</sub>
             <sub id="3">b</sub>
-            <sub id="4">c</sub>
         </root>"""
         root = test_case.assertXmlDocument(data)
 
-        # Attribute value
-        test_case.assertXpathValues(root,
-                                    './custom:sub/@id',
-                                    ['1', '2', '3', '4'],
-                                    default_ns_prefix='custom')
-        # Node text value
-        test_case.assertXpathValues(root,
-                                    './custom:sub/text()',
-                                    ['a', 'b', 'c'],
-                                    default_ns_prefix='custom')
+        test_case.assertXpathValues(root, './sub[@id=$id]/text()', ('b',),
+                                    id='3')
+        test_case.assertXpathsExist(root, ['./sub[@id=$id]'], id='1')
+        test_case.assertXpathsOnlyOne(root, ['./sub[text()=$text]'],
+                                      text='b')
+        test_case.assertXpathsUniqueValue(root, ['./sub[@id>$id]/text()'],
+                                          id=1)
 
         with self.assertRaises(test_case.failureException):
-            test_case.assertXpathValues(root,
-                                        './custom:sub/@id',
-                                        ['1', '2'],
-                                        default_ns_prefix='custom')
+            test_case.assertXpathValues(root, './sub[@id=$id]/text()',
+                                        ('b',), id='1')
 
         with self.assertRaises(test_case.failureException):
-            test_case.assertXpathValues(root,
-                                        './custom:sub/text()',
-                                        ['a', 'b'],
-                                        default_ns_prefix='custom')
+            test_case.assertXpathsExist(root, ['./sub[@id=$id]'], id='4')
+
+        with self.assertRaises(test_case.failureException):
+            test_case.assertXpathsOnlyOne(root, ['./sub[text()=$text]'],
+                                          text='a')
+
+        with self.assertRaises(test_case.failureException):
+            test_case.assertXpathsUniqueValue(root,
+                                              ['./sub[@id<$id]/text()'],
+                                              id=3)
+
+        with self.assertRaises(test_case.failureException):
+            # Undefined variable
+            test_case.assertXpathsExist(root, ['./sub[@id=$id]'])
+
+    def test_assertXpathValues_namespaces_prefix(self):
+        """Asserts assertXpathValues works with default and custom prefix."""
+        test_case = self.test_case
+        root = self.roots['ns_values']
+
+        for prefix, other, kwargs in NS_PREFIX_CASES:
+            with self.subTest(default_ns_prefix=prefix):
+                # Attribute value
+                test_case.assertXpathValues(root,
+                                            './%s:sub/@id' % prefix,
+                                            ('1', '2', '3', '4'),
+                                            **kwargs)
+                # Node text value
+                test_case.assertXpathValues(root,
+                                            './%s:sub/text()' % prefix,
+                                            ('a', 'b', 'c'),
+                                            **kwargs)
+
+                with self.assertRaises(test_case.failureException):
+                    # @id in ['3', '4'] is missing
+                    test_case.assertXpathValues(root,
+                                                './%s:sub/@id' % prefix,
+                                                ('1', '2'),
+                                                **kwargs)
+
+                with self.assertRaises(test_case.failureException):
+                    # text() == c is missing
+                    test_case.assertXpathValues(root,
+                                                './%s:sub/text()' % prefix,
+                                                ('a', 'b'),
+                                                **kwargs)
+
+                with self.assertRaises(test_case.failureException):
+                    # Unknown namespace
+                    test_case.assertXpathValues(root,
+                                                './%s:sub/@id' % other,
+                                                ('1', '2', '3', '4'),
+                                                **kwargs)
 
     def test_assertXpathValues_namespaces(self):
         """Assert assertXpathValues works with namespaces."""
-        test_case = XmlTestCase(methodName='assertXpathValues')
-        data = """<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="%s" xmlns:test="%s">
-            <sub test:id="1">a</sub>
-            <sub id="2">a</sub>
-            <sub id="3">b</sub>
-            <sub id="4">c</sub>
-            <test:sub>ns-a</test:sub>
-        </root>""" % (DEFAULT_NS, TEST_NS)
-        root = test_case.assertXmlDocument(data.encode('utf-8'))
+        test_case = self.test_case
+        root = self.roots['two_ns_values']
 
         # Attribute value without namespace
         test_case.assertXpathValues(root,
                                     './ns:sub/@id',
-                                    ['2', '3', '4'])
+                                    ('2', '3', '4'))
 
         test_case.assertXpathValues(root,
                                     './test:sub/text()',
-                                    ['ns-a'])
+                                    ('ns-a',))
 
         with self.assertRaises(test_case.failureException):
             # Only the test:id attribute has value 1
             test_case.assertXpathValues(root,
                                         './ns:sub/@id',
-                                        ['1'])
+                                        ('1',))
 
         with self.assertRaises(test_case.failureException):
             # There is only one test:id attribute, and its value is not here
             test_case.assertXpathValues(root,
                                         './ns:sub/@test:id',
-                                        ['2', '3', '4'])
+                                        ('2', '3', '4'))
 
     # -------------------------------------------------------------------------
 
+    @unittest.skipIf(not HAS_DTD, 'DTD not supported by libxml2')
     def test_assertXmlValidDTD(self):
-        """Asserts assertXmlValidDTD raises when DTD does not valid XML."""
-        test_case = XmlTestCase(methodName='assertXmlValidDTD')
-
-        dtd = """<!ELEMENT root (child)>
-        <!ELEMENT child EMPTY>
-        <!ATTLIST child id ID #REQUIRED>
-        """
-
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
+        """Asserts assertXmlValidDTD raises when DTD does not valid XML.
 
-        # Document is valid according to DTD
-        test_case.assertXmlValidDTD(root, dtd)
+        The DTD can be given as a string, as bytes, as an LXML DTD object, or
+        as the name of a DTD file.
 
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-            <child id="child1"/>
-        </root>
         """
-        root = test_case.assertXmlDocument(data_invalid)
-
-        # Document is invalid according to DTD (multiple child element)
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlValidDTD(root, dtd)
-
-    def test_assertXmlValidDTD_filename(self):
-        """Asserts assertXmlValidDTD accepts a filename as DTD."""
-        test_case = XmlTestCase(methodName='assertXmlValidDTD')
-
-        filename = 'test_assertXmlValidDTD_filename.dtd'
-        dtd = """<!ELEMENT root (child)>
-        <!ELEMENT child EMPTY>
-        <!ATTLIST child id ID #REQUIRED>
-        """
-
+        test_case = self.test_case
+
+        root = self.roots['valid_child']
+        root_invalid = self.roots['invalid_children']
+
+        for argument, value in (('dtd', DTD_SOURCE),
+                                ('dtd', DTD_SOURCE.encode('utf-8')),
+                                ('dtd', DTD_SCHEMA),
+                                ('filename', self.dtd_filename)):
+            kwargs = {argument: value}
+            with self.subTest(argument=argument, type=type(value).__name__):
+                # Document is valid according to DTD
+                test_case.assertXmlValidDTD(root, **kwargs)
+
+                # Document is invalid according to DTD (multiple child
+                # element)
+                with self.assertRaises(test_case.failureException):
+                    test_case.assertXmlValidDTD(root_invalid, **kwargs)
+
+    @unittest.skipIf(not HAS_DTD, 'DTD not supported by libxml2')
+    def test_assertXmlValidDTD_filename_changed(self):
+        """Asserts assertXmlValidDTD reloads a DTD file changed on disk."""
+        test_case = self.test_case
+        root = test_case.assertXmlDocument(b'<root><child id="c1"/></root>')
+
+        filename = os.path.join(self.tmp_dir, 'changed.dtd')
         with open(filename, 'w') as dtd_file:
-            dtd_file.write(dtd)
+            dtd_file.write('<!ELEMENT root (child)>\n'
+                           '<!ELEMENT child EMPTY>\n'
+                           '<!ATTLIST child id ID #REQUIRED>\n')
+        test_case.assertXmlValidDTD(root, filename=filename)
+        # Loaded from the cache
+        test_case.assertXmlValidDTD(root, filename=filename)
 
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
-
-        # Document is valid according to DTD
-        try:
-            test_case.assertXmlValidDTD(root, filename=filename)
-        except:
-            os.unlink(filename)
-            raise
-
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-            <child id="child1"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data_invalid)
-
-        try:
-            # Document is invalid according to DTD (multiple child element)
-            with self.assertRaises(test_case.failureException):
-                test_case.assertXmlValidDTD(root, filename=filename)
-        finally:
-            os.unlink(filename)
-
-    def test_assertXmlValidDTD_DTD(self):
-        """Asserts assertXmlValidDTD accepts an LXML DTD object."""
-        test_case = XmlTestCase(methodName='assertXmlValidDTD')
-
-        dtd = """<!ELEMENT root (child)>
-        <!ELEMENT child EMPTY>
-        <!ATTLIST child id ID #REQUIRED>
-        """
-        schema = etree.DTD(io.StringIO(dtd))
-
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
-
-        # Document is valid according to DTD
-        test_case.assertXmlValidDTD(root, schema)
-
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-            <child id="child1"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data_invalid)
+        with open(filename, 'w') as dtd_file:
+            dtd_file.write('<!ELEMENT root EMPTY>\n')
+        # Make sure the modification time is not the same
+        stat = os.stat(filename)
+        os.utime(filename, ns=(stat.st_atime_ns,
+                               stat.st_mtime_ns + 1000000000))
 
-        # Document is invalid according to DTD (multiple child element)
         with self.assertRaises(test_case.failureException):
-            test_case.assertXmlValidDTD(root, schema)
+            test_case.assertXmlValidDTD(root, filename=filename)
 
     def test_assertXmlValidDTD_no_dtd(self):
         """Asserts assertXmlValidDTD raises ValueError without any DTD."""
-        test_case = XmlTestCase(methodName='assertXmlValidDTD')
+        test_case = self.test_case
 
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
+        root = self.roots['valid_child']
 
         # No DTD: ValueError
         with self.assertRaises(ValueError):
@@ -939,165 +1098,36 @@ class TestXmlTestCase(unittest.TestCase):
 
     # -------------------------------------------------------------------------
 
+    @unittest.skipIf(not HAS_XSCHEMA,
+                     'XML Schema not supported by libxml2')
     def test_assertXmlValidXSchema(self):
         """Asserts assertXmlValidXSchema raises when schema does not valid XML.
-        """
-        test_case = XmlTestCase(methodName='assertXmlValidXSchema')
-
-        xschema = b"""<?xml version="1.0" encoding="utf-8"?>
-        <xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">
-            <xsd:element name="root">
-                <xsd:complexType>
-                    <xsd:sequence>
-                        <xsd:element name="child" minOccurs="1" maxOccurs="1">
-                            <xsd:complexType>
-                                <xsd:simpleContent>
-                                    <xsd:extension base="xsd:string">
-                                        <xsd:attribute name="id" type="xsd:string" use="required" />
-                                    </xsd:extension>
-                                </xsd:simpleContent>
-                            </xsd:complexType>
-                        </xsd:element>
-                    </xsd:sequence>
-                </xsd:complexType>
-            </xsd:element>
-        </xsd:schema>
-        """
-
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
-
-        test_case.assertXmlValidXSchema(root, xschema)
-
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-            <child id="tooManyChild"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data_invalid)
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlValidXSchema(root, xschema)
-
-    def test_assertXmlValidXSchema_filename(self):
-        """Asserts assertXmlValidXSchema raises when schema does not valid XML.
-        """
-        test_case = XmlTestCase(methodName='assertXmlValidXSchema')
-
-        xschema = """<?xml version="1.0" encoding="utf-8"?>
-        <xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">
-            <xsd:element name="root">
-                <xsd:complexType>
-                    <xsd:sequence>
-                        <xsd:element name="child" minOccurs="1" maxOccurs="1">
-                            <xsd:complexType>
-                                <xsd:simpleContent>
-                                    <xsd:extension base="xsd:string">
-                                        <xsd:attribute name="id" type="xsd:string" use="required" />
-                                    </xsd:extension>
-                                </xsd:simpleContent>
-                            </xsd:complexType>
-                        </xsd:element>
-                    </xsd:sequence>
-                </xsd:complexType>
-            </xsd:element>
-        </xsd:schema>
-        """
-
-        filename = 'test_assertXmlValidXSchema_filename.xml'
-        with open(filename, 'w') as xchema_file:
-            xchema_file.write(xschema)
-
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
-
-        try:
-            test_case.assertXmlValidXSchema(root, filename=filename)
-        except:
-            os.unlink(filename)
-            raise
-
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-            <child id="tooManyChild"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data_invalid)
-
-        try:
-            with self.assertRaises(test_case.failureException):
-                test_case.assertXmlValidXSchema(root, filename=filename)
-        finally:
-            os.unlink(filename)
-
-    def test_assertXmlValidXSchema_xschema(self):
-        """Asserts assertXmlValidXSchema raises when schema does not valid XML.
-        """
-        test_case = XmlTestCase(methodName='assertXmlValidXSchema')
-
-        xschema = b"""<?xml version="1.0" encoding="utf-8"?>
-        <xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">
-            <xsd:element name="root">
-                <xsd:complexType>
-                    <xsd:sequence>
-                        <xsd:element name="child" minOccurs="1" maxOccurs="1">
-                            <xsd:complexType>
-                                <xsd:simpleContent>
-                                    <xsd:extension base="xsd:string">
-                                        <xsd:attribute name="id" type="xsd:string" use="required" />
-                                    </xsd:extension>
-                                </xsd:simpleContent>
-                            </xsd:complexType>
-                        </xsd:element>
-                    </xsd:sequence>
-                </xsd:complexType>
-            </xsd:element>
-        </xsd:schema>
-        """
 
-        xml_schema = etree.XMLSchema(etree.XML(xschema))
+        The schema can be given as bytes, as an LXML XMLSchema object, or as the
+        name of a schema file.
 
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-        </root>
         """
-        root = test_case.assertXmlDocument(data)
+        test_case = self.test_case
 
-        test_case.assertXmlValidXSchema(root, xml_schema)
+        root = self.roots['valid_child']
+        root_invalid = self.roots['invalid_children']
 
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-            <child id="tooManyChild"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data_invalid)
+        for argument, value in (('xschema', XSCHEMA_SOURCE),
+                                ('xschema', XSCHEMA),
+                                ('filename', self.xschema_filename)):
+            kwargs = {argument: value}
+            with self.subTest(argument=argument, type=type(value).__name__):
+                test_case.assertXmlValidXSchema(root, **kwargs)
 
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlValidXSchema(root, xml_schema)
+                with self.assertRaises(test_case.failureException):
+                    test_case.assertXmlValidXSchema(root_invalid, **kwargs)
 
     def test_assertXmlValidXSchema_no_xchema(self):
         """Asserts assertXmlValidXSchema raises ValueError without any schema.
         """
-        test_case = XmlTestCase(methodName='assertXmlValidXSchema')
+        test_case = self.test_case
 
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
+        root = self.roots['valid_child']
 
         # No DTD: ValueError
         with self.assertRaises(ValueError):
@@ -1105,135 +1135,35 @@ class TestXmlTestCase(unittest.TestCase):
 
     # -------------------------------------------------------------------------
 
+    @unittest.skipIf(not HAS_RELAXNG, 'RelaxNG not supported by libxml2')
     def test_assertXmlValidRelaxNG(self):
         """Asserts assertXmlValidRelaxNG raises when schema does not valid XML.
-        """
-        test_case = XmlTestCase(methodName='assertXmlValidRelaxNG')
-
-        relaxng = b"""<?xml version="1.0" encoding="utf-8"?>
-        <rng:element name="root" xmlns:rng="http://relaxng.org/ns/structure/1.0">
-            <rng:element name="child">
-                <rng:attribute name="id">
-                    <rng:text />
-                </rng:attribute>
-            </rng:element>
-        </rng:element>
-        """
-
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
 
-        test_case.assertXmlValidRelaxNG(root, relaxng)
+        The schema can be given as bytes, as an LXML RelaxNG object, or as the
+        name of a schema file.
 
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-            <child id="tooManyChild"/>
-        </root>
         """
-        root = test_case.assertXmlDocument(data_invalid)
+        test_case = self.test_case
 
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlValidRelaxNG(root, relaxng)
+        root = self.roots['valid_child']
+        root_invalid = self.roots['invalid_children']
 
-    def test_assertXmlValidRelaxNG_filename(self):
-        """Asserts assertXmlValidRelaxNG raises when schema does not valid XML.
-        """
-        test_case = XmlTestCase(methodName='assertXmlValidRelaxNG')
-
-        relaxng = """<?xml version="1.0" encoding="utf-8"?>
-        <rng:element name="root" xmlns:rng="http://relaxng.org/ns/structure/1.0">
-            <rng:element name="child">
-                <rng:attribute name="id">
-                    <rng:text />
-                </rng:attribute>
-            </rng:element>
-        </rng:element>
-        """
+        for argument, value in (('relaxng', RELAXNG_SOURCE),
+                                ('relaxng', RELAXNG),
+                                ('filename', self.relaxng_filename)):
+            kwargs = {argument: value}
+            with self.subTest(argument=argument, type=type(value).__name__):
+                test_case.assertXmlValidRelaxNG(root, **kwargs)
 
-        filename = 'test_assertXmlValidRelaxNG_filename.xml'
-        with open(filename, 'w') as relaxng_file:
-            relaxng_file.write(relaxng)
-
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
-
-        try:
-            test_case.assertXmlValidRelaxNG(root, filename=filename)
-        except:
-            os.unlink(filename)
-            raise
-
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-            <child id="tooManyChild"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data_invalid)
-
-        try:
-            with self.assertRaises(test_case.failureException):
-                test_case.assertXmlValidRelaxNG(root, filename=filename)
-        finally:
-            os.unlink(filename)
-
-    def test_assertXmlValidRelaxNG_relaxng(self):
-        """Asserts assertXmlValidRelaxNG raises when schema does not valid XML.
-        """
-        test_case = XmlTestCase(methodName='assertXmlValidRelaxNG')
-
-        relaxng = b"""<?xml version="1.0" encoding="utf-8"?>
-        <rng:element name="root" xmlns:rng="http://relaxng.org/ns/structure/1.0">
-            <rng:element name="child">
-                <rng:attribute name="id">
-                    <rng:text />
-                </rng:attribute>
-            </rng:element>
-        </rng:element>
-        """
-
-        xml_relaxng = etree.RelaxNG(etree.XML(relaxng))
-
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
-
-        test_case.assertXmlValidRelaxNG(root, xml_relaxng)
-
-        data_invalid = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="valid"/>
-            <child id="tooManyChild"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data_invalid)
-
-        with self.assertRaises(test_case.failureException):
-            test_case.assertXmlValidRelaxNG(root, xml_relaxng)
+                with self.assertRaises(test_case.failureException):
+                    test_case.assertXmlValidRelaxNG(root_invalid, **kwargs)
 
     def test_assertXmlValidRelaxNG_no_relaxng(self):
         """Asserts assertXmlValidRelaxNG raises ValueError without any RelaxNG.
         """
-        test_case = XmlTestCase(methodName='assertXmlValidRelaxNG')
+        test_case = self.test_case
 
-        data = b"""<?xml version="1.0" encoding="utf-8"?>
-        <root>
-            <child id="child1"/>
-        </root>
-        """
-        root = test_case.assertXmlDocument(data)
+        root = self.roots['valid_child']
 
         # No DTD: ValueError
         with self.assertRaises(ValueError):
@@ -1241,6 +1171,55 @@ class TestXmlTestCase(unittest.TestCase):
 
     # -------------------------------------------------------------------------
 
+    @unittest.skipIf(not (HAS_DTD and HAS_XSCHEMA and HAS_RELAXNG),
+                     'Schemas not supported by libxml2')
+    def test_assertXmlDocumentValid(self):
+        """Asserts assertXmlDocumentValid parses and validates a document."""
+        test_case = self.test_case
+
+        data = FIXTURES['valid_child']
+        data_invalid = FIXTURES['invalid_children']
+
+        for kwargs in ({'dtd': DTD_SOURCE},
+                       {'xschema': XSCHEMA_SOURCE},
+                       {'xschema': XSCHEMA},
+                       {'relaxng': RELAXNG_SOURCE},
+                       {'dtd': DTD_SOURCE,
+                        'xschema': XSCHEMA_SOURCE,
+                        'relaxng': RELAXNG_SOURCE}):
+            with self.subTest(schemas=sorted(kwargs)):
+                root = test_case.assertXmlDocumentValid(data, **kwargs)
+                self.assertEqual(root.tag, 'root')
+
+                with self.assertRaises(test_case.failureException):
+                    test_case.assertXmlDocumentValid(data_invalid, **kwargs)
+
+                with self.assertRaises(test_case.failureException):
+                    test_case.assertXmlDocumentValid(b'<root>', **kwargs)
+
+        # No schema: ValueError
+        with self.assertRaises(ValueError):
+            test_case.assertXmlDocumentValid(data)
+
+    @unittest.skipIf(not HAS_XSCHEMA, 'XMLSchema not supported by libxml2')
+    def test_assertXmlDocumentValid_xschema_messages(self):
+        """Asserts invalid and malformed documents get their own message."""
+        test_case = self.test_case
+
+        with self.assertRaises(test_case.failureException) as context:
+            test_case.assertXmlDocumentValid(
+                FIXTURES['invalid_children'], xschema=XSCHEMA_SOURCE)
+        self.assertIn('Input is not valid according to XMLSchema',
+                      str(context.exception))
+        self.assertIn("Element 'child'", str(context.exception))
+
+        with self.assertRaises(test_case.failureException) as context:
+            test_case.assertXmlDocumentValid(b'<root>', xschema=XSCHEMA_SOURCE)
+        self.assertIn('Input is not a valid XML document',
+                      str(context.exception))
+
+    # -------------------------------------------------------------------------
+
     def test_assertXmlEquivalentOutputs(self):
         """Asserts assertXmlEquivalentOutputs raises when comparison failed.
 
@@ -1248,7 +1227,7 @@ class TestXmlTestCase(unittest.TestCase):
         text with useless spaces, etc.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlEquivalentOutputs')
+        test_case = self.test_case
 
         # Same XML (with different spacings placements and attrs order)
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
@@ -1286,7 +1265,7 @@ class TestXmlTestCase(unittest.TestCase):
         but the prefix is different. In this case, the two XML are equivalents.
 
         """
-        test_case = XmlTestCase(methodName='assertXmlEquivalentOutputs')
+        test_case = self.test_case
 
         # Same XML, but with different namespace prefixes
         data = b"""<?xml version="1.0" encoding="UTF-8" ?>
@@ -1310,36 +1289,56 @@ class TestXmlTestCase(unittest.TestCase):
         with self.assertRaises(test_case.failureException):
             test_case.assertXmlEquivalentOutputs(wrong_namespace, expected)
 
+    def test_assertXmlEquivalentOutputs_wildcards(self):
+        """Asserts assertXmlEquivalentOutputs accepts lxml's wildcards.
+
+        The canonical forms differ, so the comparison falls back to the
+        output checker, that accepts ``...`` in attribute values and text.
+
+        """
+        test_case = self.test_case
+
+        data = b'<root><tag foo="bar">some text</tag></root>'
+        expected = b'<root><tag foo="...">some ...</tag></root>'
+
+        test_case.assertXmlEquivalentOutputs(data, expected)
+
+        wrong_element = b'<root><notTag foo="bar">some text</notTag></root>'
+
+        with self.assertRaises(test_case.failureException):
+            test_case.assertXmlEquivalentOutputs(wrong_element, expected)
+
+
+FULL_DOCUMENT = ("""<?xml version="1.0" encoding="UTF-8" ?>
+<root xmlns="%s" xmlns:test="%s" rootAtt="attValue" test:rootAtt="nsValue">
+    <emptyElement />
+    <attrElement id="1" attr="simple" test:attr="namespaced" />
+    <textElement>assemblée</textElement>
+    <multipleElement />
+    <multipleElement />
+    <parent>
+        <emptyElement />
+        <attrElement id="2" attr="simple" test:attr="namespaced" uniqueAttr="" />
+        <textElement>text</textElement>
+        <multipleElement />
+        <multipleElement />
+    </parent>
+    <test:parent>
+        <emptyElement />
+        <attrElement id="3" attr="simple" test:attr="namespaced" />
+        <textElement>text</textElement>
+        <multipleElement />
+        <multipleElement />
+    </test:parent>
+</root>""" % (DEFAULT_NS, TEST_NS)).encode('utf-8')
+
 
 class TestIntegrationXmlTestCase(unittest.TestCase):
     def test_full_document(self):
-        data = """<?xml version="1.0" encoding="UTF-8" ?>
-        <root xmlns="%s" xmlns:test="%s" rootAtt="attValue" test:rootAtt="nsValue">
-            <emptyElement />
-            <attrElement id="1" attr="simple" test:attr="namespaced" />
-            <textElement>assemblée</textElement>
-            <multipleElement />
-            <multipleElement />
-            <parent>
-                <emptyElement />
-                <attrElement id="2" attr="simple" test:attr="namespaced" uniqueAttr="" />
-                <textElement>text</textElement>
-                <multipleElement />
-                <multipleElement />
-            </parent>
-            <test:parent>
-                <emptyElement />
-                <attrElement id="3" attr="simple" test:attr="namespaced" />
-                <textElement>text</textElement>
-                <multipleElement />
-                <multipleElement />
-            </test:parent>
-        </root>""" % (DEFAULT_NS, TEST_NS)
-
-        test_case = XmlTestCase(methodName='assertXmlDocument')
+        test_case = XmlTestCase()
 
         # It is a valid document.
-        root = test_case.assertXmlDocument(data.encode('utf-8'))
+        root = test_case.assertXmlDocument(FULL_DOCUMENT)
         # The root node has these namespaces
         test_case.assertXmlNamespace(root, None, DEFAULT_NS)
         test_case.assertXmlNamespace(root, 'test', TEST_NS)